@@ -10,11 +10,39 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_TIME = 600
+REQUEST_TIMEOUT = (5, 30)
+BACKOFF_BASE = 30
+BACKOFF_CAP = 3600
+BACKOFF_MAX_ATTEMPT = 7
+TELEGRAM_URL = f'https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage'
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
+RESPONSE_SCHEMA = {
+    'type': 'object',
+    'required': ['homeworks', 'current_date'],
+    'properties': {
+        'homeworks': {'type': 'array'},
+        'current_date': {'type': 'integer'},
+    },
+}
+
+SCHEMA_TYPE_MESSAGES = {
+    'data': 'Получен некорректный тип данных от сервиса API.',
+    'data.homeworks': 'В ответе сервиса API нет списка домашних работ.',
+    'data.current_date': 'Некорректная дата current_date в ответе API.',
+}
+
+PROGRAM_FAILURE_PREFIX = 'Сбой в работе программы: '
+SEND_FAILURE_PREFIX = 'Сбой при отправке сообщения: '
+
 HOMEWORK_STATUSES = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+
+VERDICT_TEMPLATES = {
+    status: ('Изменился статус проверки работы "', f'". {verdict}')
+    for status, verdict in HOMEWORK_STATUSES.items()
+}
@@ -1,52 +1,96 @@
 import sys
 import time
+import random
 import logging
 from http import HTTPStatus
 
+import fastjsonschema
+import orjson
 import requests
-from telegram import Bot
-from telegram.error import TelegramError
+from fastjsonschema import JsonSchemaException
+from requests.adapters import HTTPAdapter
 
 from exceptions import (
     SendMessageFailure, IncorrectApiAnswer, NoHomeworkInfo, WrongGetApiStatus,
     EmptyResponse, GetApiError,
 )
 from constants import (
-    PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, ENDPOINT, HEADERS,
-    HOMEWORK_STATUSES, RETRY_TIME,
+    PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_URL, ENDPOINT,
+    HEADERS,
+    VERDICT_TEMPLATES, RETRY_TIME, REQUEST_TIMEOUT, BACKOFF_BASE, BACKOFF_CAP,
+    BACKOFF_MAX_ATTEMPT, PROGRAM_FAILURE_PREFIX, SEND_FAILURE_PREFIX,
+    RESPONSE_SCHEMA, SCHEMA_TYPE_MESSAGES,
 )
 
+logger = logging.getLogger(__name__)
+_info, _error, _debug, _critical = (
+    logger.info, logger.error, logger.debug, logger.critical,
+)
+
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+# Сервис API не документирует ETag и 304 Not Modified, а каждый ответ
+# содержит новый current_date, поэтому 304 может не приходить никогда.
+# ETag хранится вместе с from_date запроса, на который он получен, и
+# передаётся в If-None-Match только при повторе того же запроса: from_date
+# не меняется, пока нет новых домашних работ. main() принимает ETag через
+# accept_etag() только после полностью успешной итерации.
+_received_etag = (None, None)
+_accepted_etag = (None, None)
+validate_response = fastjsonschema.compile(RESPONSE_SCHEMA)
 
-def send_message(bot, message):
+
+def send_message(session, message):
     """Отправка сообщения в Telegram чат."""
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
-        msg = f'Сообщение "{message}" отправлено в Telegram чат'
-        logging.info(msg)
-    except TelegramError as error:
-        msg = f'Сбой при отправке сообщения: {error}'
-        logging.error(msg)
-        raise SendMessageFailure(msg)
+        response = session.post(
+            TELEGRAM_URL,
+            data={'chat_id': TELEGRAM_CHAT_ID, 'text': message},
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        _info('Сообщение "%s" отправлено в Telegram чат', message)
+    except requests.RequestException as error:
+        # URL метода содержит токен бота, не пишем его в лог и в чат.
+        error_text = str(error)
+        if TELEGRAM_TOKEN:
+            error_text = error_text.replace(TELEGRAM_TOKEN, '<TELEGRAM_TOKEN>')
+        msg = SEND_FAILURE_PREFIX + error_text
+        _error(msg)
+        raise SendMessageFailure(msg) from None
 
 
 def get_api_answer(current_timestamp):
-    """Получение данных сервиса API Яндекс Практикум."""
+    """Получение данных сервиса API Яндекс Практикум.
+
+    Возвращает None, если сервис ответил 304 Not Modified.
+    """
+    global _received_etag
     timestamp = current_timestamp or int(time.time())
     params = {'from_date': timestamp}
+    headers = HEADERS
+    etag_date, etag = _accepted_etag
+    if etag is not None and etag_date == timestamp:
+        headers = {**HEADERS, 'If-None-Match': etag}
     try:
-        homework_statuses = requests.get(
-            ENDPOINT, headers=HEADERS, params=params,
+        homework_statuses = SESSION.get(
+            ENDPOINT, headers=headers, params=params, timeout=REQUEST_TIMEOUT,
         )
+        if homework_statuses.status_code == HTTPStatus.NOT_MODIFIED:
+            return None
         if homework_statuses.status_code != HTTPStatus.OK:
-            message = f'Статус код ответа на запрос к "{ENDPOINT}" равен '
-            f'{homework_statuses.status_code}.'
-            logging.error(message)
+            message = (
+                f'Статус код ответа на запрос к "{ENDPOINT}" равен '
+                f'{homework_statuses.status_code}.'
+            )
+            _error(message)
             raise WrongGetApiStatus(message)
     except Exception as error:
         message = f'Сбой в работе API сервиса: {error}'
-        logging.error(message)
+        _error(message)
         raise GetApiError(message)
-    response = homework_statuses.json()
+    response = orjson.loads(homework_statuses.content)
+    _received_etag = (timestamp, homework_statuses.headers.get('ETag'))
     return response
 
 
@@ -54,88 +98,108 @@ def check_response(response):
     """Проверка ответа сервиса API на корректность."""
     if response is None:
         message = 'Нет данных в ответе сервиса API.'
-        logging.error(message)
+        _error(message)
         raise EmptyResponse(message)
-    if not isinstance(response, dict):
-        message = 'Получен некорректный тип данных от сервиса API.'
-        logging.error(message)
-        raise TypeError(message)
-    if 'homeworks' not in response or 'current_date' not in response:
-        message = 'Получен некорректный ответ от сервиса API.'
-        raise IncorrectApiAnswer(message)
-    if not isinstance(response['homeworks'], list):
-        message = 'В ответе сервиса API нет списка домашних работ.'
-        logging.error(message)
+    try:
+        validate_response(response)
+    except JsonSchemaException as error:
+        if error.rule != 'type':
+            message = 'Получен некорректный ответ от сервиса API.'
+            _error(message)
+            raise IncorrectApiAnswer(message)
+        message = SCHEMA_TYPE_MESSAGES.get(
+            error.name, 'Получен некорректный тип данных от сервиса API.',
+        )
+        _error(message)
         raise TypeError(message)
     homeworks_list = response['homeworks']
     return homeworks_list
 
 
+def accept_etag():
+    """Запоминает ETag последнего успешно обработанного ответа."""
+    global _accepted_etag
+    _accepted_etag = _received_etag
+
+
 def parse_status(homework):
     """Возвращает информацию об изменении статуса домашней работы."""
     homework_name = homework.get('homework_name')
     homework_status = homework.get('status')
     if homework_name is None:
         message = 'Не найдено имя домашней работы в ответе API.'
-        logging.error(message)
+        _error(message)
         raise KeyError(message)
     if homework_status is None:
         message = 'Не найден статус домашней работы в ответе API.'
-        logging.error(message)
+        _error(message)
         raise KeyError(message)
-    verdict = HOMEWORK_STATUSES.get(homework_status)
-    if verdict is None:
+    template = VERDICT_TEMPLATES.get(homework_status)
+    if template is None:
         message = 'Недокументированный статус домашней работы в ответе API.'
-        logging.error(message)
+        _error(message)
         raise KeyError(message)
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return template[0] + homework_name + template[1]
 
 
 def check_tokens():
     """Проверка доступности переменных окружения."""
-    env_variables_available = all(
-        [PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, ]
-    )
-    return env_variables_available
+    return bool(PRACTICUM_TOKEN and TELEGRAM_TOKEN and TELEGRAM_CHAT_ID)
+
+
+def get_backoff_delay(attempt):
+    """Время ожидания перед повторным запросом после сбоя (full jitter)."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
 
 
 def main():
     """Основная логика работы бота."""
     if not check_tokens():
-        logging.critical('Недоступна одна или несколько переменных окружения.')
+        _critical('Недоступна одна или несколько переменных окружения.')
         sys.exit('Работа программы завершена.')
-    bot = Bot(token=TELEGRAM_TOKEN)
     current_timestamp = int(time.time())
-    last_message = None
-    last_error = None
+    last_message_hash = None
+    last_error_hash = None
+    attempt = 0
     while True:
         try:
             response = get_api_answer(current_timestamp=current_timestamp)
-            homeworks_list = check_response(response=response)
-            if homeworks_list:
-                homework = homeworks_list[0]
-            else:
-                message = 'Не найдено информации о домашней работе.'
-                logging.info(message)
-                raise NoHomeworkInfo(message)
-            status_str = parse_status(homework=homework)
-            if status_str != last_message:
-                send_message(bot=bot, message=status_str)
-                last_message = status_str
+            if response is None:
+                _debug('Данные сервиса API не изменились.')
             else:
-                message = 'Статус домашней работы не изменился.'
-                logging.debug(message)
-            current_timestamp = response.get('current_date')
+                homeworks_list = check_response(response=response)
+                if homeworks_list:
+                    homework = homeworks_list[0]
+                else:
+                    message = 'Не найдено информации о домашней работе.'
+                    _info(message)
+                    accept_etag()
+                    raise NoHomeworkInfo(message)
+                status_str = parse_status(homework=homework)
+                status_hash = hash(status_str)
+                if status_hash != last_message_hash:
+                    send_message(session=SESSION, message=status_str)
+                    last_message_hash = status_hash
+                else:
+                    _debug('Статус домашней работы не изменился.')
+                accept_etag()
+                current_timestamp = response.get('current_date')
         except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            logging.error(message)
-            if message != last_error:
-                send_message(bot=bot, message=message)
-                last_error = message
+            message = PROGRAM_FAILURE_PREFIX + str(error)
+            _error(message)
+            error_hash = hash(message)
+            if error_hash != last_error_hash:
+                send_message(session=SESSION, message=message)
+                last_error_hash = error_hash
+            if isinstance(error, NoHomeworkInfo):
+                attempt = 0
+                time.sleep(RETRY_TIME)
+            else:
+                time.sleep(get_backoff_delay(attempt))
+                attempt = min(attempt + 1, BACKOFF_MAX_ATTEMPT)
         else:
-            message = 'Программа отработала без ошибок.'
-            logging.info(message)
-        finally:
+            _info('Программа отработала без ошибок.')
+            attempt = 0
             time.sleep(RETRY_TIME)
 
 
@@ -1,8 +1,9 @@
+import json
 import os
+import traceback
 from http import HTTPStatus
 
 import requests
-import telegram
 import utils
 
 
@@ -44,6 +45,7 @@ class MockResponseGET:
         )
         self.random_timestamp = random_timestamp
         self.status_code = http_status
+        self.headers = {}
 
     def json(self):
         data = {
@@ -52,25 +54,100 @@ class MockResponseGET:
         }
         return data
 
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode()
 
-class MockTelegramBot:
 
-    def __init__(self, token=None, random_timestamp=None, **kwargs):
-        assert token is not None, (
-            'Проверьте, что вы передали токен бота Telegram'
-        )
-        self.random_timestamp = random_timestamp
+class MockResponsePOST:
 
-    def send_message(self, chat_id=None, text=None, **kwargs):
-        assert chat_id is not None, (
-            'Проверьте, что вы передали chat_id= при отправке '
-            'сообщения ботом Telegram'
+    def __init__(self, url, data=None, **kwargs):
+        assert url.startswith('https://api.telegram.org/bot'), (
+            'Проверьте, что вы отправляете сообщение через API Telegram'
+        )
+        assert url.endswith('/sendMessage'), (
+            'Проверьте, что вы вызываете метод sendMessage API Telegram'
+        )
+        assert data is not None, (
+            'Проверьте, что вы передали data= при отправке '
+            'сообщения в Telegram'
+        )
+        assert data.get('chat_id') is not None, (
+            'Проверьте, что вы передали chat_id при отправке '
+            'сообщения в Telegram'
         )
-        assert text is not None, (
-            'Проверьте, что вы передали text= при отправке '
-            'сообщения ботом Telegram'
+        assert data.get('text') is not None, (
+            'Проверьте, что вы передали text при отправке '
+            'сообщения в Telegram'
         )
-        return self.random_timestamp
+        self.status_code = HTTPStatus.OK
+
+    def raise_for_status(self):
+        pass
+
+
+class MockConditionalResponse:
+
+    def __init__(self, status_code, data=None, etag=None):
+        self.status_code = status_code
+        self.headers = {'ETag': etag} if etag else {}
+        self.content = json.dumps(data).encode()
+
+
+def mock_session_get(monkeypatch, homework, responses):
+    """Replaces SESSION.get with a sequence of responses, returns headers."""
+    responses = iter(responses)
+    sent_headers = []
+
+    def mock_get(url, headers=None, **kwargs):
+        sent_headers.append(headers)
+        return next(responses)
+
+    monkeypatch.setattr(homework, '_accepted_etag', (None, None))
+    monkeypatch.setattr(homework, '_received_etag', (None, None))
+    monkeypatch.setattr(homework.SESSION, 'get', mock_get)
+    return sent_headers
+
+
+class StopMainLoop(Exception):
+    pass
+
+
+def run_main(monkeypatch, homework, iterations):
+    """Runs main() for a number of iterations, returns sleeps and messages."""
+    sleeps = []
+    sent = []
+
+    def mock_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == iterations:
+            raise StopMainLoop
+
+    def mock_send_message(session, message):
+        sent.append(message)
+
+    monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 'sometoken')
+    monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', '1234:abcdefg')
+    monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', '12345')
+    monkeypatch.setattr(homework, 'send_message', mock_send_message)
+    monkeypatch.setattr(homework.time, 'sleep', mock_sleep)
+    try:
+        homework.main()
+    except StopMainLoop:
+        pass
+    return sleeps, sent
+
+
+def mock_api_answers(monkeypatch, homework, answers):
+    answers = iter(answers)
+
+    def mock_get_api_answer(current_timestamp):
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(homework, 'get_api_answer', mock_get_api_answer)
 
 
 class TestHomework:
@@ -150,33 +227,53 @@ class TestHomework:
             f'функция {func_name} возвращает True'
         )
 
-    def test_bot_init_not_global(self):
+    def test_logger(self):
         import homework
 
-        assert not (hasattr(homework, 'bot') and isinstance(getattr(homework, 'bot'), telegram.Bot)), (
-            'Убедитесь, что бот инициализирован только в main()'
+        assert hasattr(homework, 'logging'), (
+            'Убедитесь, что настроили логирование для вашего бота'
         )
 
-    def test_logger(self, monkeypatch, random_timestamp):
-        def mock_telegram_bot(*args, **kwargs):
-            return MockTelegramBot(*args, random_timestamp=random_timestamp, **kwargs)
+    def test_send_message(self, monkeypatch):
+        import homework
+
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setattr(homework.SESSION, 'post', MockResponsePOST)
 
-        monkeypatch.setattr(telegram, "Bot", mock_telegram_bot)
+        utils.check_function(homework, 'send_message', 2)
+        homework.send_message(homework.SESSION, 'test message')
 
+    def test_send_message_hides_token(self, monkeypatch):
         import homework
 
-        assert hasattr(homework, 'logging'), (
-            'Убедитесь, что настроили логирование для вашего бота'
-        )
+        token = '1234:secret'
 
-    def test_send_message(self, monkeypatch, random_timestamp):
-        def mock_telegram_bot(*args, **kwargs):
-            return MockTelegramBot(*args, random_timestamp=random_timestamp, **kwargs)
+        def mock_post(url, **kwargs):
+            raise requests.ConnectionError(
+                "HTTPSConnectionPool(host='api.telegram.org', port=443): "
+                f'Max retries exceeded with url: /bot{token}/sendMessage'
+            )
 
-        monkeypatch.setattr(telegram, "Bot", mock_telegram_bot)
+        monkeypatch.setattr(homework, 'TELEGRAM_TOKEN', token)
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setattr(homework.SESSION, 'post', mock_post)
 
-        import homework
-        utils.check_function(homework, 'send_message', 2)
+        func_name = 'send_message'
+        try:
+            homework.send_message(homework.SESSION, 'test message')
+        except homework.SendMessageFailure as error:
+            report = ''.join(traceback.format_exception(
+                type(error), error, error.__traceback__,
+            ))
+            assert token not in report, (
+                f'Убедитесь, что функция `{func_name}` не раскрывает токен '
+                'бота ни в сообщении, ни в цепочке исключений'
+            )
+        else:
+            assert False, (
+                f'Убедитесь, что функция `{func_name}` выбрасывает ошибку '
+                'при сбое отправки сообщения'
+            )
 
     def test_get_api_answers(self, monkeypatch, random_timestamp,
                              current_timestamp, api_url):
@@ -186,10 +283,10 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'get_api_answer'
         utils.check_function(homework, func_name, 1)
 
@@ -232,10 +329,10 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_500_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_500_response_get)
+
         func_name = 'get_api_answer'
         try:
             homework.get_api_answer(current_timestamp)
@@ -315,10 +412,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'check_response'
         response = homework.get_api_answer(current_timestamp)
         status = homework.check_response(response)
@@ -352,10 +449,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'parse_status'
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -400,10 +497,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'parse_status'
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -448,10 +545,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'parse_status'
         response = homework.get_api_answer(current_timestamp)
         homeworks = homework.check_response(response)
@@ -484,10 +581,10 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_no_homeworks_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_no_homeworks_response_get)
+
         func_name = 'check_response'
         result = homework.get_api_answer(current_timestamp)
         try:
@@ -525,10 +622,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'check_response'
         response = homework.get_api_answer(current_timestamp)
         try:
@@ -565,10 +662,10 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'check_response'
         response = homework.get_api_answer(current_timestamp)
         try:
@@ -599,10 +696,10 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_empty_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_empty_response_get)
+
         func_name = 'check_response'
         result = homework.get_api_answer(current_timestamp)
         try:
@@ -626,10 +723,10 @@ class TestHomework:
             )
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
-
         import homework
 
+        monkeypatch.setattr(homework.SESSION, 'get', mock_response_get)
+
         func_name = 'check_response'
         try:
             homework.get_api_answer(current_timestamp)
@@ -640,3 +737,221 @@ class TestHomework:
                 f'Убедитесь, что в функции `{func_name}` обрабатываете ситуацию, '
                 'когда API возвращает код, отличный от 200'
             )
+
+    def test_backoff_delay(self, monkeypatch):
+        import homework
+
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: (a, b))
+
+        func_name = 'get_backoff_delay'
+        assert homework.get_backoff_delay(0) == (0, homework.BACKOFF_BASE), (
+            f'Проверьте, что `{func_name}` после первого сбоя ждёт '
+            'не дольше BACKOFF_BASE'
+        )
+        assert homework.get_backoff_delay(2) == (
+            0, homework.BACKOFF_BASE * 4
+        ), (
+            f'Проверьте, что `{func_name}` удваивает верхнюю границу '
+            'паузы с каждой попыткой'
+        )
+        assert homework.get_backoff_delay(
+            homework.BACKOFF_MAX_ATTEMPT
+        ) == (0, homework.BACKOFF_CAP), (
+            f'Проверьте, что `{func_name}` ограничивает паузу BACKOFF_CAP'
+        )
+
+    def test_main_backoff_resets_after_success(self, monkeypatch):
+        import homework
+
+        valid_response = {
+            'homeworks': [{'homework_name': 'hw123', 'status': 'approved'}],
+            'current_date': 1000198000,
+        }
+        error = homework.GetApiError('Сбой в работе API сервиса')
+        mock_api_answers(
+            monkeypatch, homework, [error, error, valid_response, error],
+        )
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: b)
+
+        sleeps, _ = run_main(monkeypatch, homework, 4)
+        base = homework.BACKOFF_BASE
+        assert sleeps == [base, base * 2, homework.RETRY_TIME, base], (
+            'Проверьте, что пауза растёт после каждого сбоя подряд '
+            'и сбрасывается после успешного запроса'
+        )
+
+    def test_main_no_homework_keeps_retry_time(self, monkeypatch):
+        import homework
+
+        empty_response = {'homeworks': [], 'current_date': 1000198000}
+        error = homework.GetApiError('Сбой в работе API сервиса')
+        mock_api_answers(monkeypatch, homework, [
+            error, error, empty_response, empty_response, error,
+        ])
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: b)
+
+        sleeps, sent = run_main(monkeypatch, homework, 5)
+        base = homework.BACKOFF_BASE
+        assert sleeps == [
+            base, base * 2, homework.RETRY_TIME, homework.RETRY_TIME, base,
+        ], (
+            'Проверьте, что при отсутствии новых домашних работ бот '
+            'опрашивает API раз в RETRY_TIME и сбрасывает паузу '
+            'после сбоев'
+        )
+        assert len(sent) == 3, (
+            'Проверьте, что одинаковое сообщение об ошибке '
+            'не отправляется повторно'
+        )
+
+    def test_get_api_answer_not_modified(self, monkeypatch,
+                                         current_timestamp):
+        import homework
+
+        mock_session_get(
+            monkeypatch, homework,
+            [MockConditionalResponse(HTTPStatus.NOT_MODIFIED)],
+        )
+
+        func_name = 'get_api_answer'
+        assert homework.get_api_answer(current_timestamp) is None, (
+            f'Проверьте, что `{func_name}` возвращает None, '
+            'если API ответил 304 Not Modified'
+        )
+
+    def test_main_sends_if_none_match(self, monkeypatch):
+        import homework
+
+        empty_response = {'homeworks': [], 'current_date': 1000198000}
+        sent_headers = mock_session_get(monkeypatch, homework, [
+            MockConditionalResponse(HTTPStatus.OK, empty_response, '"v1"'),
+            MockConditionalResponse(HTTPStatus.NOT_MODIFIED),
+        ])
+        checked = []
+        check_response = homework.check_response
+
+        def mock_check_response(response):
+            checked.append(response)
+            return check_response(response)
+
+        monkeypatch.setattr(homework, 'check_response', mock_check_response)
+
+        sleeps, sent = run_main(monkeypatch, homework, 2)
+        assert 'If-None-Match' not in sent_headers[0], (
+            'Проверьте, что первый запрос отправляется без If-None-Match'
+        )
+        assert sent_headers[1].get('If-None-Match') == '"v1"', (
+            'Проверьте, что после ответа с ETag повтор того же запроса '
+            'передаёт его в заголовке If-None-Match'
+        )
+        assert len(checked) == 1 and len(sent) == 1, (
+            'Проверьте, что ответ 304 не проверяется и не приводит '
+            'к отправке сообщения'
+        )
+        assert sleeps == [homework.RETRY_TIME, homework.RETRY_TIME], (
+            'Проверьте, что ответ 304 обрабатывается как обычный опрос'
+        )
+
+    def test_main_new_from_date_skips_etag(self, monkeypatch):
+        import homework
+
+        valid_response = {
+            'homeworks': [{'homework_name': 'hw123', 'status': 'approved'}],
+            'current_date': 1000198000,
+        }
+        sent_headers = mock_session_get(monkeypatch, homework, [
+            MockConditionalResponse(HTTPStatus.OK, valid_response, '"v1"'),
+            MockConditionalResponse(HTTPStatus.OK, valid_response),
+        ])
+
+        run_main(monkeypatch, homework, 2)
+        assert 'If-None-Match' not in sent_headers[1], (
+            'Проверьте, что ETag не передаётся в запросе '
+            'с другим значением from_date'
+        )
+
+    def test_main_bad_status_etag_not_stored(self, monkeypatch):
+        import homework
+
+        bad_status_response = {
+            'homeworks': [{'homework_name': 'hw123', 'status': 'unknown'}],
+            'current_date': 1000198000,
+        }
+        sent_headers = mock_session_get(monkeypatch, homework, [
+            MockConditionalResponse(HTTPStatus.OK, bad_status_response, '"v1"'),
+            MockConditionalResponse(HTTPStatus.NOT_MODIFIED),
+        ])
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: b)
+
+        run_main(monkeypatch, homework, 2)
+        assert 'If-None-Match' not in sent_headers[1], (
+            'Проверьте, что ETag ответа с недокументированным статусом '
+            'не сохраняется'
+        )
+
+    def test_main_malformed_response_etag_not_stored(self, monkeypatch):
+        import homework
+
+        malformed_response = {'current_date': 1000198000}
+        sent_headers = mock_session_get(monkeypatch, homework, [
+            MockConditionalResponse(HTTPStatus.OK, malformed_response, '"v1"'),
+            MockConditionalResponse(HTTPStatus.OK, malformed_response),
+        ])
+        monkeypatch.setattr(homework.random, 'uniform', lambda a, b: b)
+
+        run_main(monkeypatch, homework, 2)
+        assert 'If-None-Match' not in sent_headers[1], (
+            'Проверьте, что ETag ответа, не прошедшего проверку, '
+            'не сохраняется'
+        )
+
+    def test_parse_status_none_values(self):
+        import homework
+
+        func_name = 'parse_status'
+        cases = [
+            ({'homework_name': None, 'status': 'approved'},
+             'Не найдено имя домашней работы в ответе API.'),
+            ({'homework_name': 'hw123', 'status': None},
+             'Не найден статус домашней работы в ответе API.'),
+            ({'homework_name': 'hw123', 'status': 'homework_name'},
+             'Недокументированный статус домашней работы в ответе API.'),
+        ]
+        for test_data, expected in cases:
+            try:
+                homework.parse_status(test_data)
+            except KeyError as error:
+                assert error.args[0] == expected, (
+                    f'Проверьте сообщение об ошибке функции `{func_name}` '
+                    f'для данных {test_data}'
+                )
+            else:
+                assert False, (
+                    f'Убедитесь, что функция `{func_name}` выбрасывает '
+                    f'KeyError для данных {test_data}'
+                )
+
+    def test_check_response_unmapped_type_error(self, monkeypatch):
+        import homework
+
+        schema = dict(homework.RESPONSE_SCHEMA)
+        schema['properties'] = {
+            **schema['properties'], 'extra': {'type': 'string'},
+        }
+        monkeypatch.setattr(
+            homework, 'validate_response',
+            homework.fastjsonschema.compile(schema),
+        )
+
+        func_name = 'check_response'
+        try:
+            homework.check_response(
+                {'homeworks': [], 'current_date': 1000198000, 'extra': 1}
+            )
+        except TypeError:
+            pass
+        else:
+            assert False, (
+                f'Убедитесь, что функция `{func_name}` выбрасывает TypeError '
+                'для поля схемы без отдельного сообщения об ошибке'
+            )